@@ -8,7 +8,7 @@ from pymc_experimental.statespace.core.statespace import PyMCStateSpace, floatX
 from pymc_experimental.statespace.models.utilities import (
     make_default_coords,
     make_harvey_state_names,
-    make_SARIMA_transition_matrix,
+    make_SARIMA_transition,
 )
 from pymc_experimental.statespace.utils.constants import (
     ALL_STATE_AUX_DIM,
@@ -298,7 +298,7 @@ class BayesianSARIMA(PyMCStateSpace):
         if self.state_structure == "fast":
             p, d, q = self.p, self.d, self.q
             P, D, Q, S = self.P, self.D, self.Q, self.S
-            states = make_harvey_state_names(p, d, q, P, D, Q, S)
+            states = list(make_harvey_state_names(p, d, q, P, D, Q, S))
 
         elif self.state_structure == "interpretable":
             states = ["data"]
@@ -401,17 +401,14 @@ class BayesianSARIMA(PyMCStateSpace):
 
         # Set up the transition and selection matrices, depending on the requested representation
         if self.state_structure == "fast":
-            transition = make_SARIMA_transition_matrix(p, d, q, P, D, Q, S)
-            selection = np.r_[
-                [0] * self._k_diffs, [1.0], np.zeros(self.k_states - self._k_diffs - 1)
-            ][:, None]
+            transition = make_SARIMA_transition(p, d, q, P, D, Q, S)
+            n_diffs = transition.n_diffs
+            selection = np.r_[[0] * n_diffs, [1.0], np.zeros(transition.k_lags - 1)][:, None]
 
-            ar_param_idx = np.s_[
-                "transition", self._k_diffs : self._k_diffs + self.p, self._k_diffs
-            ]
-            ma_param_idx = np.s_["selection", 1 + self._k_diffs : 1 + self._k_diffs + self.q, 0]
+            ar_param_idx = np.s_["transition", n_diffs : n_diffs + self.p, n_diffs]
+            ma_param_idx = np.s_["selection", 1 + n_diffs : 1 + n_diffs + self.q, 0]
 
-            self.ssm["transition"] = transition
+            self.ssm["transition"] = transition.T
             self.ssm["selection"] = selection
 
             if p > 0:
@@ -422,15 +419,15 @@ class BayesianSARIMA(PyMCStateSpace):
                 seasonal_ar_params = self.make_and_register_variable(
                     "seasonal_ar_params", shape=(P,), dtype=floatX
                 )
-                idx_rows = self._k_diffs + (np.arange(1, P + 1) * S) - 1
-                S_ar_param_idx = np.s_["transition", idx_rows, self._k_diffs]
+                idx_rows = n_diffs + (np.arange(1, P + 1) * S) - 1
+                S_ar_param_idx = np.s_["transition", idx_rows, n_diffs]
                 self.ssm[S_ar_param_idx] = seasonal_ar_params
 
                 if p > 0:
                     cross_term_idx = np.s_[
                         "transition",
                         idx_rows.repeat(p) + np.tile(np.arange(p), P) + 1,
-                        self._k_diffs,
+                        n_diffs,
                     ]
                     self.ssm[cross_term_idx] = -pt.repeat(seasonal_ar_params, p) * pt.tile(
                         ar_params, P
@@ -444,7 +441,7 @@ class BayesianSARIMA(PyMCStateSpace):
                 seasonal_ma_params = self.make_and_register_variable(
                     "seasonal_ma_params", shape=(Q,), dtype=floatX
                 )
-                idx_rows = self._k_diffs + np.arange(1, Q + 1) * S
+                idx_rows = n_diffs + np.arange(1, Q + 1) * S
                 S_ma_param_idx = np.s_["selection", idx_rows, 0]
                 self.ssm[S_ma_param_idx] = seasonal_ma_params
 
@@ -1,5 +1,11 @@
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+
 import numpy as np
 import pytensor.tensor as pt
+import scipy.sparse
+from numpy.typing import DTypeLike
 
 from pymc_experimental.statespace.utils.constants import (
     ALL_STATE_AUX_DIM,
@@ -13,6 +19,11 @@ from pymc_experimental.statespace.utils.constants import (
     VECTOR_VALUED,
 )
 
+# Meaningless terms produced by make_harvey_state_names; see cleanup_states
+_MEANINGLESS_STATE_TERMS = re.compile(r"\^[01]|L0|D0")
+
+_STATESPACE_MATRIX_NAMES = frozenset(MATRIX_NAMES) | frozenset(LONG_MATRIX_NAMES)
+
 
 def make_default_coords(ss_mod):
     coords = {
@@ -48,17 +59,22 @@ def cleanup_states(states: list[str]) -> list[str]:
     difference, and i is the number of repeated applications. Dk^1 is thus just Dk.
     """
 
-    out = []
-    for state in states:
-        state = state.replace("^1", "")
-        state = state.replace("^0", "")
-        state = state.replace("L0", "")
-        state = state.replace("D0", "")
-        out.append(state)
-    return out
+    return [_MEANINGLESS_STATE_TERMS.sub("", state) for state in states]
 
 
-def make_harvey_state_names(p: int, d: int, q: int, P: int, D: int, Q: int, S: int) -> list[str]:
+def _SARIMA_state_counts(p: int, d: int, q: int, P: int, D: int, Q: int, S: int) -> tuple[int, int]:
+    """
+    Number of differencing states and number of companion ("lag") states in the Harvey SARIMA representation
+    """
+    n_diffs = S * D + d
+    k_lags = max(p + P * S, q + Q * S + 1)
+    return n_diffs, k_lags
+
+
+@lru_cache(maxsize=256)
+def make_harvey_state_names(
+    p: int, d: int, q: int, P: int, D: int, Q: int, S: int
+) -> tuple[str, ...]:
     """
     Generate informative names for the SARIMA states in the Harvey representation
 
@@ -81,14 +97,15 @@ def make_harvey_state_names(p: int, d: int, q: int, P: int, D: int, Q: int, S: i
 
     Returns
     -------
-    state_names, list of str
-        List of state names
+    state_names, tuple of str
+        Tuple of state names. Results are cached, so the same object is returned for repeated calls with the same
+        orders.
 
     The Harvey state is not particularly interpretable, but it's also not totally opaque. This helper function makes
     a list of state names that can help users understand what they are getting back from the statespace. In particular,
     it is helpful to know how differences and seasonal differences are incorporated into the model
     """
-    k_lags = max(p + P * S, q + Q * S + 1)
+    _, k_lags = _SARIMA_state_counts(p, d, q, P, D, Q, S)
     has_diff = (d + D) > 0
 
     # First state is always data
@@ -98,7 +115,7 @@ def make_harvey_state_names(p: int, d: int, q: int, P: int, D: int, Q: int, S: i
     # The goal here is to get down to "data_star", the state that actually has the SARIMA dynamics applied to it.
     # To get there, first the data needs to be differenced d-1 times
     d_size = d + int(D > 0)
-    states.extend([f"D1^{(i + 1)}.data" for i in range(d_size)[:-1]])
+    states += [f"D1^{i}.data" for i in range(1, d_size)]
 
     # Next, if there are seasonal differences, we need to lag the ARIMA differenced state S times, then seasonal
     # difference it. This procedure is done D-1 times.
@@ -107,7 +124,7 @@ def make_harvey_state_names(p: int, d: int, q: int, P: int, D: int, Q: int, S: i
     season_diff = [S, 0]
     curr_state = f"D{arma_diff[0]}^{arma_diff[1]}"
     for i in range(D):
-        states.extend([f"L{j + 1}{curr_state}.data" for j in range(S - 1)])
+        states += [f"L{j}{curr_state}.data" for j in range(1, S)]
         season_diff[1] += 1
         curr_state = f"D{arma_diff[0]}^{arma_diff[1]}D{season_diff[0]}^{season_diff[1]}"
         if i != (D - 1):
@@ -120,16 +137,24 @@ def make_harvey_state_names(p: int, d: int, q: int, P: int, D: int, Q: int, S: i
     # Next, we add the time series dynamics states. These don't have a immediately obvious interpretation, so just call
     # them "state_1" .., "state_n".
     suffix = "_star" if "star" in states[-1] else ""
-    states.extend([f"state{suffix}_{i + 1}" for i in range(k_lags - 1)])
+    states += [f"state{suffix}_{i}" for i in range(1, k_lags)]
 
     states = cleanup_states(states)
 
-    return states
+    return tuple(states)
 
 
 def make_SARIMA_transition_matrix(
-    p: int, d: int, q: int, P: int, D: int, Q: int, S: int
-) -> np.ndarray:
+    p: int,
+    d: int,
+    q: int,
+    P: int,
+    D: int,
+    Q: int,
+    S: int,
+    sparse: bool = False,
+    dtype: DTypeLike = np.float32,
+) -> np.ndarray | scipy.sparse.csr_array:
     r"""
     Make the transition matrix for a SARIMA model
 
@@ -149,11 +174,19 @@ def make_SARIMA_transition_matrix(
         Seasonal MA order
     S: int
         Seasonal length
+    sparse: bool, default False
+        If True, return the transition matrix as a ``scipy.sparse.csr_array``. The matrix has O(k_states) non-zero
+        entries, so the sparse representation is much smaller than the dense one for models with long seasonal lags.
+    dtype: DTypeLike, default np.float32
+        Data type of the returned matrix. All entries are 0 or 1, so they are represented exactly by any float (or
+        integer) type.
 
     Returns
     -------
-    T, ndarray
-        The transition matrix associated with a SARIMA model of order (p,d,q)x(P,D,Q,S)
+    T, ndarray or csr_array
+        The transition matrix associated with a SARIMA model of order (p,d,q)x(P,D,Q,S). Dense results are cached,
+        so the returned array is shared between calls and is marked read-only. Copy it before modifying it in place.
+        Sparse results are built fresh from cached indices on every call, and can be modified freely.
 
     Notes
     -----
@@ -252,15 +285,128 @@ def make_SARIMA_transition_matrix(
             0 & 0 & 0 & 0 & 0 & 0 & 0 & 0 & 1 & 0 & 0 \\
             0 & 0 & 0 & 0 & 0 & 0 & 0 & 0 & 0 & 0 & 0 \end{bmatrix}
     """
-    n_diffs = S * D + d
-    k_lags = max(p + P * S, q + Q * S + 1)
-    k_states = k_lags + n_diffs
+    if D > 0 and S <= 0:
+        raise ValueError(
+            f"Seasonal differencing requires a positive seasonal length, got D = {D} and S = {S}"
+        )
+
+    if sparse:
+        # A csr_array can be mutated through its attributes even if its buffers are read-only, so it is not safe to
+        # share between callers. Build a new one from the cached indices instead.
+        k_states = sum(_SARIMA_state_counts(p, d, q, P, D, Q, S))
+        rows, cols = _make_SARIMA_transition_indices(p, d, q, P, D, Q, S)
+        values = np.ones(rows.shape[0], dtype=dtype)
+        return scipy.sparse.csr_array((values, (rows, cols)), shape=(k_states, k_states))
+
+    # Normalize the dtype so that equivalent specifications (np.float32, "float32", ...) share a cache entry
+    return _make_SARIMA_transition_matrix(p, d, q, P, D, Q, S, np.dtype(dtype))
+
+
+@lru_cache(maxsize=256)
+def _make_SARIMA_transition_matrix(
+    p: int, d: int, q: int, P: int, D: int, Q: int, S: int, dtype: np.dtype
+) -> np.ndarray:
+    """
+    Cached implementation of make_SARIMA_transition_matrix, for dense matrices
+    """
+    k_states = sum(_SARIMA_state_counts(p, d, q, P, D, Q, S))
+
+    # All of the non-zero entries of T are 1, so T is built by collecting the (row, col) index of each non-zero entry,
+    # then scattering ones into those positions in a single write.
+    rows, cols = _make_SARIMA_transition_indices(p, d, q, P, D, Q, S)
+
+    T = np.zeros((k_states, k_states), dtype=dtype)
+    T[rows, cols] = 1
+    T.setflags(write=False)
+
+    return T
+
+
+@dataclass(frozen=True, eq=False)
+class SARIMATransition:
+    """
+    A SARIMA transition matrix, together with the layout of its blocks
+
+    Attributes
+    ----------
+    T: ndarray
+        The (read-only) transition matrix, as returned by make_SARIMA_transition_matrix
+    n_diffs: int
+        Number of differencing states, S * D + d
+    k_lags: int
+        Number of states in the companion part of the matrix, max(p + P * S, q + Q * S + 1)
+    """
+
+    T: np.ndarray
+    n_diffs: int
+    k_lags: int
+
+    @property
+    def diff_block(self) -> slice:
+        """Slice selecting the differencing states"""
+        return slice(0, self.n_diffs)
+
+    @property
+    def companion_block(self) -> slice:
+        """Slice selecting the states of the companion ("rolling") part of the matrix"""
+        return slice(self.n_diffs, self.n_diffs + self.k_lags)
+
+
+def make_SARIMA_transition(
+    p: int, d: int, q: int, P: int, D: int, Q: int, S: int, dtype: DTypeLike = np.float32
+) -> SARIMATransition:
+    """
+    Make the transition matrix for a SARIMA model, along with the slices of its differencing and companion blocks
+
+    Parameters
+    ----------
+    p, d, q, P, D, Q, S: int
+        SARIMA orders, see make_SARIMA_transition_matrix
+    dtype: DTypeLike, default np.float32
+        Data type of the transition matrix
+
+    Returns
+    -------
+    transition, SARIMATransition
+        The transition matrix and the layout of its blocks. For example, the companion matrix is
+        ``transition.T[transition.companion_block, transition.companion_block]``.
+    """
+    T = make_SARIMA_transition_matrix(p, d, q, P, D, Q, S, dtype=dtype)
+    n_diffs, k_lags = _SARIMA_state_counts(p, d, q, P, D, Q, S)
+    return SARIMATransition(T=T, n_diffs=n_diffs, k_lags=k_lags)
+
+
+@lru_cache(maxsize=256)
+def _make_SARIMA_transition_indices(
+    p: int, d: int, q: int, P: int, D: int, Q: int, S: int
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Compute the (row, col) positions of the non-zero entries of the SARIMA transition matrix
+
+    See make_SARIMA_transition_matrix for a description of the structure of the matrix. Results are cached, and the
+    returned arrays are read-only.
+    """
+    n_diffs, k_lags = _SARIMA_state_counts(p, d, q, P, D, Q, S)
+
+    # Bottom part
+    # Rolling indices for the "compute" states, x_star
+    star_roll_row, star_roll_col = np.diag_indices(k_lags - 1)
+    star_roll_row = star_roll_row + n_diffs
+    star_roll_col = star_roll_col + n_diffs + 1
 
     # Top Part
     # ARIMA differences
-    T = np.zeros((k_states, k_states))
-    diff_idx = np.triu_indices(d)
-    T[diff_idx] = 1
+    diff_row_idx, diff_col_idx = np.triu_indices(d)
+
+    if D == 0:
+        # Special case: If there are *only* ARIMA lags, the top part is the (d, d) upper triangle of 1s, plus a single
+        # column of 1s at position [:d, d]. None of the seasonal index arithmetic below is needed.
+        rows = np.concatenate([diff_row_idx, np.arange(d), star_roll_row])
+        cols = np.concatenate([diff_col_idx, np.full(d, d), star_roll_col])
+        rows.setflags(write=False)
+        cols.setflags(write=False)
+
+        return rows, cols
 
     # Adjustment factors for difference states All of the difference states are computed relative to x_t_star using
     # combinations of states, so there's a lot of "backing out" that needs to happen here. The columns are the more
@@ -269,48 +415,38 @@ def make_SARIMA_transition_matrix(
 
     # This will slowly taper down, but first we build the "full" set of column indices with values
     base_col_idx = d + S + np.arange(D) * S - 1
-    if len(base_col_idx) > 0:
-        base_col_idx = np.r_[base_col_idx, base_col_idx[-1] + 1]
+    base_col_idx = np.r_[base_col_idx, base_col_idx[-1] + 1]
 
     # The first d rows -- associated with the ARIMA differences -- will have 1s in all columns.
-    col_idx = np.tile(base_col_idx, d)
-    row_idx = np.arange(d).repeat(D + 1)
+    col_blocks = [np.tile(base_col_idx, d)]
+    row_blocks = [np.arange(d).repeat(D + 1)]
 
     # Next, if there are seasonal differences, there will be more rows, with the columns slowly dropping off.
     # Starting from the d+1-th row, there will be 1 in the column positions every S rows, for a total of (D-1) rows.
-    # Every row will drop 2 columns from the left of base_col_idx.
+    # Every row will drop 2 columns from the left of base_col_idx. The blocks are collected in lists and joined once
+    # at the end, rather than growing the index arrays on every iteration.
     for i in range(D):
-        n = len(base_col_idx[i:])
-        col_idx = np.r_[col_idx, base_col_idx[i:]]
-        row_idx = np.r_[row_idx, np.full(n, d + S * i)]
+        col_blocks.append(base_col_idx[i:])
+        row_blocks.append(np.full(D + 1 - i, d + S * i))
 
-    if D == 0 and d > 0:
-        # Special case: If there are *only* ARIMA lags, there still needs to be a single column of 1s at position
-        # [:d, d]
-        row_idx = np.arange(d)
-        col_idx = np.full(d, d)
-    T[row_idx, col_idx] = 1
+    # "Rolling" indices for seasonal differences
+    row_roll_idx, col_roll_idx = np.diag_indices(S * D)
+    row_roll_idx = row_roll_idx + d + 1
+    col_roll_idx = col_roll_idx + d
 
     if S > 0:
-        # "Rolling" indices for seasonal differences
-        (row_roll_idx, col_roll_idx) = np.diag_indices(S * D)
-        row_roll_idx = row_roll_idx + d + 1
-        col_roll_idx = col_roll_idx + d
-
         # Rolling indices have a zero after every diagonal of length S-1
-        T[row_roll_idx, col_roll_idx] = 1
-        zero_idx = row_roll_idx[S - 1 :: S], col_roll_idx[S - 1 :: S]
-        T[zero_idx] = 0
-
-    # Bottom part
-    # Rolling indices for the "compute" states, x_star
-    star_roll_row, star_roll_col = np.diag_indices(k_lags - 1)
-    star_roll_row = star_roll_row + n_diffs
-    star_roll_col = star_roll_col + n_diffs + 1
+        is_nonzero = np.ones(S * D, dtype=bool)
+        is_nonzero[S - 1 :: S] = False
+        row_roll_idx = row_roll_idx[is_nonzero]
+        col_roll_idx = col_roll_idx[is_nonzero]
 
-    T[star_roll_row, star_roll_col] = 1
+    rows = np.concatenate([diff_row_idx, *row_blocks, row_roll_idx, star_roll_row])
+    cols = np.concatenate([diff_col_idx, *col_blocks, col_roll_idx, star_roll_col])
+    rows.setflags(write=False)
+    cols.setflags(write=False)
 
-    return T
+    return rows, cols
 
 
 def conform_time_varying_and_time_invariant_matrices(A, B):
@@ -339,12 +475,12 @@ def conform_time_varying_and_time_invariant_matrices(A, B):
     if A.name == B.name:
         name = A.name
     else:
-        if all([X.name not in MATRIX_NAMES + LONG_MATRIX_NAMES for X in [A, B]]):
+        if A.name not in _STATESPACE_MATRIX_NAMES and B.name not in _STATESPACE_MATRIX_NAMES:
             raise ValueError(
                 "At least one matrix passed to conform_time_varying_and_time_invariant_matrices should be a "
                 "statespace matrix"
             )
-        name = A.name if A.name in MATRIX_NAMES + LONG_MATRIX_NAMES else B.name
+        name = A.name if A.name in _STATESPACE_MATRIX_NAMES else B.name
 
     time_varying_ndim = 3 - int(name in VECTOR_VALUED)
 
@@ -375,13 +511,11 @@ def conform_time_varying_and_time_invariant_matrices(A, B):
 
 
 def get_exog_dims_from_idata(exog_name, idata):
-    if exog_name in idata.posterior.data_vars:
-        exog_dims = idata.posterior[exog_name].dims[2:]
-    elif exog_name in getattr(idata, "constant_data", []):
-        exog_dims = idata.constant_data[exog_name].dims
-    elif exog_name in getattr(idata, "mutable_data", []):
-        exog_dims = idata.mutable_data[exog_name].dims
-    else:
-        exog_dims = None
-
-    return exog_dims
+    for group in ("posterior", "constant_data", "mutable_data"):
+        dataset = getattr(idata, group, None)
+        if dataset is not None and exog_name in dataset.data_vars:
+            exog_dims = dataset[exog_name].dims
+            # Posterior variables carry leading (chain, draw) dimensions
+            return exog_dims[2:] if group == "posterior" else exog_dims
+
+    return None
@@ -11,6 +11,7 @@ from numpy.testing import assert_allclose, assert_array_less
 from pymc_experimental.statespace import BayesianSARIMA
 from pymc_experimental.statespace.models.utilities import (
     make_harvey_state_names,
+    make_SARIMA_transition,
     make_SARIMA_transition_matrix,
 )
 from pymc_experimental.statespace.utils.constants import (
@@ -245,6 +246,89 @@ def test_make_SARIMA_transition_matrix(p, d, q, P, D, Q, S):
         assert_allclose(T, T2, err_msg="Transition matrix does not match statsmodels")
 
 
+@pytest.mark.parametrize("p,d,q,P,D,Q,S", test_orders)
+def test_make_SARIMA_transition_matrix_sparse(p, d, q, P, D, Q, S):
+    T = make_SARIMA_transition_matrix(p, d, q, P, D, Q, S)
+    T_sparse = make_SARIMA_transition_matrix(p, d, q, P, D, Q, S, sparse=True)
+
+    assert T_sparse.format == "csr"
+    assert T_sparse.nnz == np.count_nonzero(T)
+    assert_allclose(T_sparse.toarray(), T)
+
+
+@pytest.mark.parametrize("sparse", [False, True])
+def test_make_SARIMA_transition_matrix_raises_on_seasonal_diff_without_season(sparse):
+    with pytest.raises(ValueError, match="positive seasonal length"):
+        make_SARIMA_transition_matrix(1, 0, 0, 0, 1, 0, 0, sparse=sparse)
+
+
+@pytest.mark.parametrize("dtype", [np.float32, np.float64, np.int8])
+def test_make_SARIMA_transition_matrix_dtype(dtype):
+    T = make_SARIMA_transition_matrix(2, 1, 1, 1, 1, 1, 4, dtype=dtype)
+    T_sparse = make_SARIMA_transition_matrix(2, 1, 1, 1, 1, 1, 4, sparse=True, dtype=dtype)
+
+    assert T.dtype == dtype
+    assert T_sparse.dtype == dtype
+    assert_allclose(T, make_SARIMA_transition_matrix(2, 1, 1, 1, 1, 1, 4))
+
+
+def test_make_SARIMA_transition_matrix_dtype_specs_share_cache():
+    T = make_SARIMA_transition_matrix(2, 1, 1, 1, 1, 1, 4, dtype=np.float32)
+    assert make_SARIMA_transition_matrix(2, 1, 1, 1, 1, 1, 4) is T
+    assert make_SARIMA_transition_matrix(2, 1, 1, 1, 1, 1, 4, dtype="float32") is T
+    assert make_SARIMA_transition_matrix(2, 1, 1, 1, 1, 1, 4, dtype=np.dtype("float32")) is T
+
+
+@pytest.mark.parametrize("p,d,q,P,D,Q,S", test_orders)
+def test_make_SARIMA_transition(p, d, q, P, D, Q, S):
+    transition = make_SARIMA_transition(p, d, q, P, D, Q, S)
+    T = make_SARIMA_transition_matrix(p, d, q, P, D, Q, S)
+    k_lags = max(p + P * S, q + Q * S + 1)
+
+    assert_allclose(transition.T, T)
+    assert transition.n_diffs == S * D + d
+    assert transition.k_lags == k_lags
+
+    companion = transition.T[transition.companion_block, transition.companion_block]
+    assert_allclose(companion, np.eye(k_lags, k=1))
+
+    if D > 2:
+        pytest.skip("Statsmodels has a bug when D > 2, skip this test.")
+
+    mod = sm.tsa.SARIMAX(np.random.normal(size=100), order=(p, d, q), seasonal_order=(P, D, Q, S))
+    T2 = mod.ssm["transition"]
+    assert_allclose(transition.T[transition.diff_block], T2[: S * D + d])
+
+
+def test_SARIMA_transition_equality_and_hash():
+    transition = make_SARIMA_transition(1, 1, 1, 1, 1, 1, 4)
+    transition_64 = make_SARIMA_transition(1, 1, 1, 1, 1, 1, 4, dtype=np.float64)
+
+    assert transition == transition
+    assert transition != transition_64
+    assert len({transition, transition_64}) == 2
+    assert hash(transition) == hash(transition)
+
+
+def test_SARIMA_helpers_are_cached():
+    T = make_SARIMA_transition_matrix(2, 1, 1, 1, 1, 1, 4)
+    assert make_SARIMA_transition_matrix(2, 1, 1, 1, 1, 1, 4) is T
+    assert not T.flags.writeable
+
+    T_sparse = make_SARIMA_transition_matrix(2, 1, 1, 1, 1, 1, 4, sparse=True)
+    k_states = T_sparse.shape[0]
+    T_sparse.data *= 3
+    T_sparse.resize((k_states + 1, k_states + 1))
+
+    T_sparse_new = make_SARIMA_transition_matrix(2, 1, 1, 1, 1, 1, 4, sparse=True)
+    assert T_sparse_new is not T_sparse
+    assert T_sparse_new.shape == (k_states, k_states)
+    assert_allclose(T_sparse_new.toarray(), T)
+
+    states = make_harvey_state_names(2, 1, 1, 1, 1, 1, 4)
+    assert make_harvey_state_names(2, 1, 1, 1, 1, 1, 4) is states
+
+
 @pytest.mark.parametrize("p, d, q, P, D, Q, S", test_orders, ids=ids)
 @pytest.mark.filterwarnings(
     "ignore:Non-invertible starting MA parameters found.",
@@ -1,5 +1,6 @@
 from contextlib import nullcontext as does_not_raise
 
+import arviz as az
 import numpy as np
 import pandas as pd
 import pymc as pm
@@ -8,6 +9,7 @@ import pytensor.tensor as pt
 import pytest
 
 from pymc_experimental.statespace.models import structural
+from pymc_experimental.statespace.models.utilities import get_exog_dims_from_idata
 from pymc_experimental.statespace.utils.constants import (
     FILTER_OUTPUT_DIMS,
     FILTER_OUTPUT_NAMES,
@@ -116,3 +118,27 @@ def test_data_index_is_coord(f, warning, create_model):
     with warning:
         pymc_model = create_model(f)
     assert TIME_DIM in pymc_model.coords
+
+
+def test_get_exog_dims_from_idata():
+    idata = az.from_dict(
+        posterior={"beta_exog": np.zeros((2, 10, 3))},
+        constant_data={"data_exog": np.zeros((5, 3))},
+        dims={"beta_exog": ["exog_state"], "data_exog": ["time", "exog_state"]},
+    )
+
+    # Posterior variables drop their (chain, draw) dims
+    assert get_exog_dims_from_idata("beta_exog", idata) == ("exog_state",)
+    assert get_exog_dims_from_idata("data_exog", idata) == ("time", "exog_state")
+
+    # Only data variables are matched, not coordinates
+    assert get_exog_dims_from_idata("time", idata) is None
+    assert get_exog_dims_from_idata("missing", idata) is None
+
+    # Groups that are not present are skipped
+    idata_no_posterior = az.from_dict(
+        constant_data={"data_exog": np.zeros((5, 3))},
+        dims={"data_exog": ["time", "exog_state"]},
+    )
+    assert get_exog_dims_from_idata("data_exog", idata_no_posterior) == ("time", "exog_state")
+    assert get_exog_dims_from_idata("beta_exog", idata_no_posterior) is None
@@ -14,6 +14,9 @@ from numpy.testing import assert_allclose
 from scipy import linalg
 
 from pymc_experimental.statespace import structural as st
+from pymc_experimental.statespace.models.utilities import (
+    conform_time_varying_and_time_invariant_matrices,
+)
 from pymc_experimental.statespace.utils.constants import (
     ALL_STATE_AUX_DIM,
     ALL_STATE_DIM,
@@ -789,6 +792,22 @@ def test_filter_scans_time_varying_design_matrix(rng):
     assert_allclose(prior_Z[0, :, :, 0, :], data.values[None].repeat(10, axis=0))
 
 
+def test_conform_time_invariant_matrix_to_time_varying():
+    Z_invariant = pt.as_tensor(np.ones((1, 1, 2), dtype=floatX), name="design")
+    Z_varying = pt.tensor("design", shape=(None, 1, 3), dtype=floatX)
+
+    Z_invariant_out, Z_varying_out = conform_time_varying_and_time_invariant_matrices(
+        Z_invariant, Z_varying
+    )
+    assert Z_varying_out is Z_varying
+    assert Z_invariant_out.name == "design"
+    assert Z_invariant_out.type.shape == (None, 1, 2)
+
+    Z_value = np.zeros((5, 1, 3), dtype=floatX)
+    Z = pt.concatenate([Z_invariant_out, Z_varying_out], axis=-1).eval({Z_varying: Z_value})
+    assert_allclose(Z, np.concatenate([np.ones((5, 1, 2)), Z_value], axis=-1))
+
+
 @pytest.mark.skipif(floatX.endswith("32"), reason="Prior covariance not PSD at half-precision")
 def test_extract_components_from_idata(rng):
     time_idx = pd.date_range(start="2000-01-01", freq="D", periods=100)